@@ -4,21 +4,58 @@ ChatGPT-Compatible Context7 MCP Bridge
 Implements ChatGPT's search/fetch specification while using Context7 internally.
 """
 
+import asyncio
+import atexit
 import json
 import logging
 import os
+import re
 import subprocess
 import hashlib
+import itertools
 import threading
 import time
-import signal
-import sys
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _loads(data) -> Any:
+    """Parse JSON from str/bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# The MCP handshake frames are invariant for the process lifetime;
+# serialize them once at import time.
+_INIT_BYTES = (
+    _dumps_bytes({
+        "jsonrpc": "2.0",
+        "id": 0,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "ChatGPT-Context7-Bridge", "version": "1.0.0"}
+        }
+    }) + b"\n" +
+    _dumps_bytes({"jsonrpc": "2.0", "method": "notifications/initialized"}) + b"\n"
+)
+
 # Configure logging
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
@@ -26,203 +63,403 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-read timeout on the MCP pipe. Tighter than the old 60s default so a
+# stuck npx fails fast instead of pinning a request for a full minute.
+_TIMEOUT = float(os.getenv("CONTEXT7_TIMEOUT", "15"))
+
+# One C-level scan over the Context7 response instead of per-line
+# startswith/replace chains in Python.
+_LIB_FIELD_RE = re.compile(
+    r"^-\s+(Title|Context7-compatible library ID|Description|Code Snippets|Trust Score):\s*(.*)$",
+    re.MULTILINE
+)
+_LIB_FIELD_MAP = {
+    "Description": "text",
+    "Code Snippets": "snippets",
+    "Trust Score": "trust_score",
+}
+
+# Captures the optional |topic:...|tokens:... params of a fetch id in one pass.
+_FETCH_PARAM_RE = re.compile(r"\|(topic|tokens):([^|]*)")
+
+# Every failure string _call_context7 can return. Results matching these must
+# never be cached, or a transient subprocess failure would be served for the
+# full cache TTL.
+_FAILURE_PREFIXES = (
+    "Error calling Context7",
+    "Could not get response from Context7 server",
+    "No valid response from Context7 server",
+)
+
+class TTLCache:
+    """Small thread-safe LRU cache with per-entry TTL.
+
+    Used to short-circuit repeated Context7 round-trips: ChatGPT sessions
+    frequently re-issue identical resolve/docs queries.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stamp = entry
+            if time.monotonic() - stamp > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
 class Context7Client:
-    """Client for calling Context7 MCP server."""
+    """Client for calling Context7 MCP server over a persistent stdio subprocess.
+
+    The MCP server is spawned once and the initialize handshake is performed a
+    single time; subsequent tool calls are multiplexed over the same pipes and
+    matched to their responses by JSON-RPC id. This avoids paying the Node
+    startup + npx resolution + handshake cost on every search/fetch.
+    """
+
+    npx_commands = [
+        ["npx", "-y", "@upstash/context7-mcp", "--transport", "stdio"],
+        ["C:\\Program Files\\nodejs\\npx.cmd", "-y", "@upstash/context7-mcp", "--transport", "stdio"],
+        ["C:\\Users\\S\\AppData\\Roaming\\npm\\npx.cmd", "-y", "@upstash/context7-mcp", "--transport", "stdio"],
+        ["wsl", "npx", "-y", "@upstash/context7-mcp", "--transport", "stdio"]
+    ]
+
+    # Class-level so the memoized responses survive client/bridge rebuilds.
+    _resolve_cache = TTLCache(maxsize=512, ttl=3600)
+    _docs_cache = TTLCache(maxsize=512, ttl=3600)
+
     def __init__(self):
-        self.request_id = 1
-    def _get_request_id(self):
-        self.request_id += 1
-        return self.request_id
+        # next() on a count is atomic under the GIL, so concurrent callers
+        # can never mint the same JSON-RPC id. Id 0 is reserved for the
+        # initialize handshake.
+        self._id_counter = itertools.count(1)
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self._initialized = False
+        self._resolved_cmd: Optional[List[str]] = None
+        atexit.register(self.shutdown)
 
-    def _call_context7(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+    async def _ensure_started(self) -> bool:
+        """Start the MCP subprocess and run the handshake if not already running."""
+        if self._proc is not None and self._proc.returncode is None and self._initialized:
+            return True
+        # Previous process died (or never started) - reset and relaunch.
+        self.shutdown()
+        # Try the previously working command first so restarts skip the
+        # FileNotFoundError probes; fall back to the full list if it broke.
+        commands = self.npx_commands
+        if self._resolved_cmd is not None:
+            commands = [self._resolved_cmd] + [c for c in self.npx_commands if c != self._resolved_cmd]
+        last_error = None
+        for cmd in commands:
+            proc = None
+            try:
+                logger.debug(f"Trying command: {cmd}")
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+                proc.stdin.write(_INIT_BYTES)
+                await proc.stdin.drain()
+                line = await asyncio.wait_for(proc.stdout.readline(), timeout=_TIMEOUT)
+                response = _loads(line) if line.strip() else {}
+                if response.get("id") == 0 and "result" in response:
+                    logger.info(f"Context7 MCP server started: {cmd[0]}")
+                    self._proc = proc
+                    self._initialized = True
+                    self._resolved_cmd = cmd
+                    return True
+                last_error = f"Command {cmd[0]} failed handshake"
+            except (FileNotFoundError, OSError, asyncio.TimeoutError, ValueError) as e:
+                last_error = f"Command {cmd[0]} error: {e}"
+            except Exception as e:
+                last_error = f"Unexpected error with {cmd[0]}: {e}"
+            # Any non-success path (bad handshake, timeout, parse or pipe
+            # error) must kill the child it spawned, or a stuck npx leaks
+            # one live Node process per failed probe.
+            if proc is not None and proc.returncode is None:
+                try:
+                    proc.terminate()
+                except (OSError, ProcessLookupError):
+                    pass
+        logger.error(f"Could not start Context7 server. Last error: {last_error}")
+        return False
+
+    async def connect(self) -> bool:
+        """Start the MCP subprocess eagerly (e.g. at app startup)."""
+        async with self._lock:
+            return await self._ensure_started()
+
+    def shutdown(self):
+        """Terminate the MCP subprocess and reset handshake state."""
+        if self._proc is not None:
+            try:
+                if self._proc.returncode is None:
+                    self._proc.terminate()
+            except (OSError, ProcessLookupError):
+                pass
+            self._proc = None
+        self._initialized = False
+
+    async def _call_context7(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         try:
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": 0,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {"name": "ChatGPT-Context7-Bridge", "version": "1.0.0"}
+            async with self._lock:
+                if not await self._ensure_started():
+                    return "Could not get response from Context7 server."
+                target_id = next(self._id_counter)
+                tool_request = {
+                    "jsonrpc": "2.0",
+                    "id": target_id,
+                    "method": "tools/call",
+                    "params": {"name": tool_name, "arguments": arguments}
                 }
-            }
-            initialized_notification = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-            tool_request = {
-                "jsonrpc": "2.0",
-                "id": self._get_request_id(),
-                "method": "tools/call",
-                "params": {"name": tool_name, "arguments": arguments}
-            }
-            input_data = (
-                json.dumps(init_request) + "\n" +
-                json.dumps(initialized_notification) + "\n" +
-                json.dumps(tool_request) + "\n"
-            )
-            npx_commands = [
-                ["npx", "-y", "@upstash/context7-mcp", "--transport", "stdio"],
-                ["C:\\Program Files\\nodejs\\npx.cmd", "-y", "@upstash/context7-mcp", "--transport", "stdio"],
-                ["C:\\Users\\S\\AppData\\Roaming\\npm\\npx.cmd", "-y", "@upstash/context7-mcp", "--transport", "stdio"],
-                ["wsl", "npx", "-y", "@upstash/context7-mcp", "--transport", "stdio"]
-            ]
-            result = None
-            last_error = None
-            for cmd in npx_commands:
-                try:
-                    logger.debug(f"Trying command: {cmd}")
-                    result = subprocess.run(
-                        cmd,
-                        input=input_data,
-                        capture_output=True,
-                        text=True,
-                        encoding='utf-8',
-                        errors='ignore',
-                        timeout=60
-                    )
-                    if result.returncode == 0 and result.stdout:
-                        break
-                    last_error = f"Command {cmd[0]} failed: returncode={result.returncode}"
-                except (FileNotFoundError, subprocess.TimeoutExpired) as e:
-                    last_error = f"Command {cmd[0]} error: {e}"
-                    continue
-                except Exception as e:
-                    last_error = f"Unexpected error with {cmd[0]}: {e}"
-                    continue
-            if not result or not result.stdout:
-                return f"Could not get response from Context7 server. Last error: {last_error}"
-            if result.returncode != 0:
-                logger.error(f"Context7 server error: {result.stderr}")
-                return f"Error calling Context7: {result.stderr}"
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
                 try:
-                    response = json.loads(line)
-                    if response.get("id") == self.request_id and "result" in response:
-                        content = response["result"].get("content", [])
-                        if content and content[0].get("type") == "text":
-                            return content[0]["text"]
-                except json.JSONDecodeError:
-                    continue
-            return "No valid response from Context7 server"
+                    # One write per logical request (frame + newline together)
+                    # keeps this a single syscall once the loop flushes.
+                    self._proc.stdin.write(_dumps_bytes(tool_request) + b"\n")
+                    await self._proc.stdin.drain()
+                    while True:
+                        line = await asyncio.wait_for(self._proc.stdout.readline(), timeout=_TIMEOUT)
+                        if not line:
+                            break
+                        if not line.strip():
+                            continue
+                        try:
+                            response = _loads(line)
+                        except ValueError:
+                            continue
+                        if response.get("id") != target_id:
+                            continue
+                        # Our reply: stop reading immediately, whether it is a
+                        # result, an error, or malformed content.
+                        if "result" in response:
+                            content = response["result"].get("content", [])
+                            if content and content[0].get("type") == "text":
+                                return content[0]["text"]
+                        elif "error" in response:
+                            message = response["error"].get("message", "unknown error")
+                            logger.error(f"Context7 server error: {message}")
+                            return f"Error calling Context7: {message}"
+                        return "No valid response from Context7 server"
+                except (BrokenPipeError, ConnectionResetError, OSError, asyncio.TimeoutError) as e:
+                    logger.error(f"Context7 pipe error, restarting subprocess: {e}")
+                    self.shutdown()
+                    return f"Error calling Context7: {e}"
+                # EOF without a matching response: the child is gone or unusable.
+                self.shutdown()
+                return "No valid response from Context7 server"
         except Exception as e:
             logger.error(f"Error calling Context7: {e}")
             return f"Error calling Context7: {e}"
 
-    def resolve_library_id(self, library_name: str) -> str:
-        return self._call_context7("resolve-library-id", {"libraryName": library_name})
+    async def resolve_library_id(self, library_name: str) -> str:
+        key = library_name.lower().strip()
+        cached = self._resolve_cache.get(key)
+        if cached is not None:
+            logger.debug(f"resolve-library-id cache hit: {key}")
+            return cached
+        result = await self._call_context7("resolve-library-id", {"libraryName": library_name})
+        if not result.startswith(_FAILURE_PREFIXES):
+            self._resolve_cache.set(key, result)
+        return result
 
-    def get_library_docs(self, library_id: str, topic: Optional[str] = None, tokens: int = 10000) -> str:
+    async def get_library_docs(self, library_id: str, topic: Optional[str] = None, tokens: int = 10000) -> str:
+        key = (library_id, topic or '', tokens)
+        cached = self._docs_cache.get(key)
+        if cached is not None:
+            logger.debug(f"get-library-docs cache hit: {key}")
+            return cached
         args = {"context7CompatibleLibraryID": library_id, "tokens": tokens}
         if topic:
             args["topic"] = topic
-        return self._call_context7("get-library-docs", args)
+        result = await self._call_context7("get-library-docs", args)
+        if not result.startswith(_FAILURE_PREFIXES):
+            self._docs_cache.set(key, result)
+        return result
+
+# One shared client so every bridge instance multiplexes over the same
+# persistent MCP subprocess instead of spawning its own.
+_CLIENT = Context7Client()
 
 class ChatGPTContext7Bridge:
     def __init__(self):
-        self.context7 = Context7Client()
-        self.search_cache: Dict[str, Any] = {}
+        self.context7 = _CLIENT
+        # result-id -> library info, LRU-bounded so a long-running server
+        # does not accumulate an entry per unique search forever.
+        self.search_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._search_cache_max = 10000
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_evictions = 0
+
+    def _cache_put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._search_cache_lock:
+            self.search_cache[key] = value
+            self.search_cache.move_to_end(key)
+            while len(self.search_cache) > self._search_cache_max:
+                self.search_cache.popitem(last=False)
+                self._search_cache_evictions += 1
+                if self._search_cache_evictions % 1000 == 0:
+                    logger.info(f"search_cache evicted {self._search_cache_evictions} entries so far")
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._search_cache_lock:
+            value = self.search_cache.get(key)
+            if value is not None:
+                self.search_cache.move_to_end(key)
+            return value
 
     def parse_library_info(self, response_text: str) -> List[Dict[str, Any]]:
+        # The regex sweep cannot raise on string input and every captured
+        # field name is covered below, so no exception envelope is needed.
         results = []
-        try:
-            lines = response_text.split('\n')
-            current = {}
-            for line in lines:
-                line = line.strip()
-                if line.startswith('- Title:'):
-                    if current.get('id'):
-                        results.append(current)
-                    current = {"title": line.replace('- Title:', '').strip()}
-                elif line.startswith('- Context7-compatible library ID:'):
-                    lib_id = line.replace('- Context7-compatible library ID:', '').strip()
-                    current.update({"id": lib_id, "library_id": lib_id})
-                elif line.startswith('- Description:'):
-                    current['text'] = line.replace('- Description:', '').strip()
-                elif line.startswith('- Code Snippets:'):
-                    current['snippets'] = line.replace('- Code Snippets:', '').strip()
-                elif line.startswith('- Trust Score:'):
-                    current['trust_score'] = line.replace('- Trust Score:', '').strip()
-            if current.get('id'):
-                results.append(current)
-        except Exception as e:
-            logger.error(f"Error parsing Context7 response: {e}")
-        return results[:10]
+        current = {}
+        for match in _LIB_FIELD_RE.finditer(response_text):
+            field, value = match.group(1), match.group(2).strip()
+            if field == 'Title':
+                if current.get('id'):
+                    results.append(current)
+                    if len(results) >= 10:
+                        # Only 10 results are returned; skip the rest of
+                        # the response instead of parsing and discarding.
+                        current = {}
+                        break
+                current = {"title": value}
+            elif field == 'Context7-compatible library ID':
+                current.update({"id": value, "library_id": value})
+            else:
+                current[_LIB_FIELD_MAP[field]] = value
+        if current.get('id') and len(results) < 10:
+            results.append(current)
+        return results
 
-    def search(self, query: str) -> Dict[str, Any]:
+    async def search(self, query: str) -> Dict[str, Any]:
         try:
             logger.info(f"Searching for: {query}")
             # Determine if direct ID query
             if query.startswith('/') and '/' in query[1:]:
-                docs = self.context7.get_library_docs(query, tokens=100)
+                docs = await self.context7.get_library_docs(query, tokens=100)
                 if "Error calling Context7" in docs:
                     return {"results": []}
-                rid = hashlib.md5(f"{query}:direct".encode()).hexdigest()
-                self.search_cache[rid] = {"library_id": query, "query": query}
-                return {"results": [{"id": rid, "title": query, "text": docs, "url": f"https://context7.com{query}"}]}  
+                # The library ID is already a valid fetch id, so no hash or
+                # cache entry is needed for this branch.
+                return {"results": [{"id": query, "title": query, "text": docs, "url": f"https://context7.com{query}"}]}
             # Normal search
-            resp = self.context7.resolve_library_id(query)
+            resp = await self.context7.resolve_library_id(query)
             if "Error calling Context7" in resp:
                 return {"results": []}
             libs = self.parse_library_info(resp)
             results = []
             for lib in libs:
                 if not lib.get('id'): continue
-                rid = hashlib.md5(f"{lib['id']}:{query}".encode()).hexdigest()
-                self.search_cache[rid] = {"library_id": lib['id'], "query": query}
-                desc = lib.get('text', '')
-                meta = []
-                if lib.get('snippets'): meta.append(f"Snippets: {lib['snippets']}")
-                if lib.get('trust_score'): meta.append(f"Trust: {lib['trust_score']}")
-                content = f"{desc}\n[{' | '.join(meta)}]\nID: {lib['id']}"
+                rid = hashlib.blake2b(f"{lib['id']}:{query}".encode(), digest_size=16).hexdigest()
+                self._cache_put(rid, {"library_id": lib['id'], "query": query})
+                content = (
+                    f"{lib.get('text', '')}\n"
+                    f"[Snippets: {lib.get('snippets', '0')} | Trust: {lib.get('trust_score', '0')}]\n"
+                    f"ID: {lib['id']}"
+                )
                 results.append({"id": rid, "title": lib['title'], "text": content, "url": f"https://context7.com{lib['id']}"})
             return {"results": results}
         except Exception as e:
             logger.error(f"Search error: {e}")
             return {"results": []}
 
-    def fetch(self, id: str) -> Dict[str, Any]:
+    async def fetch(self, id: str) -> Dict[str, Any]:
         try:
             logger.info(f"Fetching document: {id}")
-            parts = id.split('|')
-            base = parts[0]
+            # Common case is a bare id with no params: partition avoids any
+            # allocation, and one regex pass captures both optional params.
+            base, sep, rest = id.partition('|')
             topic = None
             tokens = 10000
-            for p in parts[1:]:
-                if p.startswith('topic:'): topic = p.split(':',1)[1]
-                if p.startswith('tokens:'):
-                    try: tokens = max(int(p.split(':',1)[1]), 10000)
-                    except: pass
-            if base in self.search_cache:
-                lib_id = self.search_cache[base]['library_id']
-            else:
-                lib_id = base
-            docs = self.context7.get_library_docs(lib_id, topic=topic, tokens=tokens)
+            if sep:
+                opts = dict(_FETCH_PARAM_RE.findall('|' + rest))
+                topic = opts.get('topic')
+                if 'tokens' in opts:
+                    try: tokens = max(int(opts['tokens']), 10000)
+                    except ValueError: pass
+            cached = self._cache_get(base)
+            lib_id = cached['library_id'] if cached is not None else base
+            docs = await self.context7.get_library_docs(lib_id, topic=topic, tokens=tokens)
             return {"id": id, "title": base, "text": docs, "url": f"https://context7.com{lib_id}"}
         except Exception as e:
             logger.error(f"Fetch error: {e}")
             raise ValueError(f"Failed to fetch: {e}")
 
-# Instantiate
+# Instantiate. SIGINT/SIGTERM are left to uvicorn's own handlers so
+# in-flight requests drain before the shutdown event and atexit hook
+# terminate the MCP subprocess.
 bridge = ChatGPTContext7Bridge()
-app = FastAPI(title="ChatGPT Context7 MCP Bridge")
 
-# CORS
+app = FastAPI(
+    title="ChatGPT Context7 MCP Bridge",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
+
+# CORS. Enumerated origins let starlette take the simple-match fast path
+# instead of reconciling wildcard-with-credentials per request; extra
+# origins (e.g. the current ngrok URL) come from ALLOWED_ORIGINS.
+_allowed_origins = ["https://chat.openai.com", "https://chatgpt.com"]
+_allowed_origins += [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=_allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup_event():
+    # Warm the MCP subprocess so the first request doesn't pay npx startup
+    # plus the handshake.
+    await bridge.context7.connect()
+    # Optionally prime the resolve/docs caches with a common query without
+    # delaying port binding (e.g. CONTEXT7_WARMUP_QUERY=react).
+    warmup_query = os.getenv("CONTEXT7_WARMUP_QUERY")
+    if warmup_query:
+        asyncio.create_task(bridge.search(warmup_query))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    bridge.context7.shutdown()
+
 # Alias MCP endpoints for ChatGPT UI health check
 @app.post("/search")
-async def mcp_search(request: Request):
-    return await app(scope=request.scope, receive=request.receive, send=request.send)
+async def mcp_search(payload: Dict[str, Any]):
+    return await bridge.search(payload.get("query", ""))
 
 @app.post("/fetch")
-async def mcp_fetch(request: Request):
-    return await app(scope=request.scope, receive=request.receive, send=request.send)
+async def mcp_fetch(payload: Dict[str, Any]):
+    return await bridge.fetch(payload.get("id", ""))
+
+# Static JSON-RPC result bodies, built once instead of per request.
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {"name": "Context7 Documentation Search", "version": "1.0.0"}
+}
+_TOOLS_LIST_RESULT = {"tools": [
+    {"name":"search","description":"Search Context7 docs","inputSchema":{"type":"object","properties":{"query":{"type":"string"}},"required":["query"]}},
+    {"name":"fetch","description":"Fetch doc by ID","inputSchema":{"type":"object","properties":{"id":{"type":"string"}},"required":["id"]}}
+]}
 
 # JSON-RPC SSE endpoint
 @app.post("/sse")
@@ -230,25 +467,39 @@ async def sse_endpoint(request: Dict[str, Any]):
     method = request.get("method")
     request_id = request.get("id")
     if method == "initialize":
-        return {"jsonrpc":"2.0","id":request_id,"result": {"protocolVersion":"2024-11-05","capabilities":{"tools":{}},"serverInfo":{"name":"Context7 Documentation Search","version":"1.0.0"}}}
+        return {"jsonrpc":"2.0","id":request_id,"result": _INITIALIZE_RESULT}
     elif method == "tools/list":
-        return {"jsonrpc":"2.0","id":request_id,"result": {"tools": [
-            {"name":"search","description":"Search Context7 docs","inputSchema":{"type":"object","properties":{"query":{"type":"string"}},"required":["query"]}},
-            {"name":"fetch","description":"Fetch doc by ID","inputSchema":{"type":"object","properties":{"id":{"type":"string"}},"required":["id"]}}
-        ]}}
+        return {"jsonrpc":"2.0","id":request_id,"result": _TOOLS_LIST_RESULT}
     elif method == "tools/call":
         tool = request.get("params",{}).get("name")
         args = request.get("params",{}).get("arguments",{})
         try:
             if tool == "search":
-                result = bridge.search(args.get("query",""))
+                result = await bridge.search(args.get("query",""))
             elif tool == "fetch":
-                result = bridge.fetch(args.get("id",""))
+                result = await bridge.fetch(args.get("id",""))
             else:
                 raise ValueError(f"Unknown tool {tool}")
-            return {"jsonrpc":"2.0","id":request_id,"result":{"content":[{"type":"text","text":json.dumps(result)}]}}
+            return {"jsonrpc":"2.0","id":request_id,"result":{"content":[{"type":"text","text":_dumps_bytes(result).decode()}]}}
         except Exception as e:
             return {"jsonrpc":"2.0","id":request_id,"error":{"code":-32603,"message":str(e)}}
+    elif method == "tools/batch_call":
+        # Aggregator: run several search/fetch calls over the one persistent
+        # MCP connection concurrently instead of one round-trip per request.
+        calls = request.get("params",{}).get("calls",[])
+        async def _run_one(call: Dict[str, Any]) -> Dict[str, Any]:
+            name = call.get("name")
+            args = call.get("arguments",{})
+            try:
+                if name == "search":
+                    return await bridge.search(args.get("query",""))
+                elif name == "fetch":
+                    return await bridge.fetch(args.get("id",""))
+                return {"error": f"Unknown tool {name}"}
+            except Exception as e:
+                return {"error": str(e)}
+        results = await asyncio.gather(*(_run_one(c) for c in calls))
+        return {"jsonrpc":"2.0","id":request_id,"result":{"content":[{"type":"text","text":_dumps_bytes(list(results)).decode()}]}}
     return {"jsonrpc":"2.0","id":request_id,"error":{"code":-32601,"message":f"Method not found: {method}"}}
 
 # Health endpoints
@@ -262,4 +513,13 @@ async def root():
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("context7_bridge:app", host="0.0.0.0", port=port)
+    uvicorn.run(
+        "context7_bridge:app",
+        host="0.0.0.0",
+        port=port,
+        # "auto" picks uvloop where it is installed (non-Windows per
+        # requirements.txt) and falls back to asyncio elsewhere.
+        loop="auto",
+        http="httptools",
+        timeout_graceful_shutdown=30
+    )